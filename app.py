@@ -3,16 +3,24 @@ Main application file for the Bioenergy Project Dashboard.
 This file contains the Streamlit UI components and application logic.
 """
 
+from collections import ChainMap
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.graph_objects as go
-from feedstock_data import DEFAULT_FEEDSTOCKS, get_feedstock_df, calculate_biogas_yield, get_total_metrics
+from feedstock_data import (DEFAULT_FEEDSTOCKS, DEFAULT_FEEDSTOCK_CARDS, FEEDSTOCK_BASE, 
+                            calculate_feedstock_metrics_np)
 from process_calculations import (calculate_digester_size, calculate_biogas_to_energy, 
                                  calculate_parasitic_load, calculate_digestate_production, size_chp_units)
-from financial_calculations import calculate_capex, calculate_opex, calculate_lcoe, calculate_financial_metrics
+from financial_calculations import (calculate_capex, calculate_opex, calculate_lcoe, calculate_lcoe_vec, 
+                                    calculate_npv_vec, calculate_cash_flows, calculate_financial_metrics)
+
+# Chart colour palettes
+_GREENS = px.colors.sequential.Greens
+_SENS_COLORS = ['#2E7D32', '#4CAF50', '#81C784', '#1B5E20']
 
 # Set page configuration
 st.set_page_config(
@@ -58,10 +66,32 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Fields of an active feedstock that feed into the yield and cost calculations
+FEEDSTOCK_STATE_FIELDS = ['quantity', 'distance', 'ts', 'vs', 'bmp', 'ch4', 'tkn', 'tan', 'cost_per_tonne']
+
+# Defaults for the Assumptions tab inputs; submitted values are read back from session state by key
+ASSUMPTION_DEFAULTS = {
+    'digester_cost_per_m3': 500,
+    'chp_cost_per_kw': 1500,
+    'upgrading_cost_per_m3h': 10000,
+    'maintenance_percentage': 3.0,
+    'labor_cost_small': 150000,
+    'consumables_cost_per_tonne': 2.5,
+    'biogas_price': 15.0,
+    'electricity_price': 100.0,
+    'heat_price': 10.0,
+    'tax_rate': 30.0,
+}
+
 # Initialize session state
 if 'active_feedstocks' not in st.session_state:
     st.session_state.active_feedstocks = {}
     
+if 'feedstock_cols' not in st.session_state:
+    # Active feedstock fields as one NumPy array per field, in the order of feedstock_names
+    st.session_state.feedstock_names = []
+    st.session_state.feedstock_cols = {field: np.empty(0) for field in FEEDSTOCK_STATE_FIELDS}
+    
 if 'output_type' not in st.session_state:
     st.session_state.output_type = 'biogas'
     
@@ -71,15 +101,160 @@ if 'project_scale' not in st.session_state:
 # Function to add a feedstock to active feedstocks
 def add_feedstock(feedstock_name):
     if feedstock_name not in st.session_state.active_feedstocks:
-        st.session_state.active_feedstocks[feedstock_name] = DEFAULT_FEEDSTOCKS[feedstock_name].copy()
+        # Only the user-adjustable fields are stored; the rest resolve through FEEDSTOCK_BASE
+        base = FEEDSTOCK_BASE[feedstock_name]
+        feedstock_data = {
+            'original_quantity': base['quantity'],
+            'quantity': int(base['quantity'] * st.session_state.project_scale),
+            'distance': base['distance'],
+        }
+        # The quantity slider takes its value from session state, starting at the scaled default
+        st.session_state[f"quantity_{feedstock_name}"] = feedstock_data['quantity']
+        st.session_state.active_feedstocks[feedstock_name] = feedstock_data
+        st.session_state.feedstock_names.append(feedstock_name)
+        feedstock_fields = ChainMap(feedstock_data, base)
+        st.session_state.feedstock_cols = {
+            field: np.append(values, feedstock_fields[field])
+            for field, values in st.session_state.feedstock_cols.items()
+        }
         st.success(f"Added {feedstock_name} to active feedstocks")
 
 # Function to remove a feedstock from active feedstocks
 def remove_feedstock(feedstock_name):
     if feedstock_name in st.session_state.active_feedstocks:
         del st.session_state.active_feedstocks[feedstock_name]
+        index = st.session_state.feedstock_names.index(feedstock_name)
+        del st.session_state.feedstock_names[index]
+        st.session_state.feedstock_cols = {
+            field: np.delete(values, index)
+            for field, values in st.session_state.feedstock_cols.items()
+        }
         st.success(f"Removed {feedstock_name} from active feedstocks")
 
+# Function to reset the quantity sliders to the scaled defaults when the project scale changes
+def rescale_feedstock_quantities(project_scale):
+    for feedstock_name, feedstock_data in st.session_state.active_feedstocks.items():
+        st.session_state[f"quantity_{feedstock_name}"] = int(feedstock_data['original_quantity'] * project_scale)
+
+# Function to read the quantity and distance sliders back into session state in one pass
+def sync_feedstock_sliders():
+    quantities = st.session_state.feedstock_cols['quantity']
+    distances = st.session_state.feedstock_cols['distance']
+    for index, feedstock_name in enumerate(st.session_state.feedstock_names):
+        feedstock_data = st.session_state.active_feedstocks[feedstock_name]
+        if f"quantity_{feedstock_name}" in st.session_state:
+            feedstock_data['quantity'] = st.session_state[f"quantity_{feedstock_name}"]
+        if f"distance_{feedstock_name}" in st.session_state:
+            feedstock_data['distance'] = st.session_state[f"distance_{feedstock_name}"]
+        quantities[index] = feedstock_data['quantity']
+        distances[index] = feedstock_data['distance']
+
+# Function to get the applied value of an Assumptions tab input
+def get_assumption(key):
+    return st.session_state.get(key, ASSUMPTION_DEFAULTS[key])
+
+# Cached biogas yield and total metrics for the active feedstocks
+@st.cache_data
+def _compute_feedstock_state(names, cols):
+    """
+    Calculate biogas yields and total metrics for the active feedstocks.
+    
+    Args:
+        names (tuple): Active feedstock names
+        cols (dict): Active feedstock fields as NumPy arrays aligned with names, with the
+            slider quantities (already scaled) in 'quantity'
+    
+    Returns:
+        tuple: Calculated feedstock DataFrame and dictionary of total metrics
+    """
+    derived, totals = calculate_feedstock_metrics_np(cols)
+    
+    # The DataFrame is only built for display, once the arrays have been calculated
+    calculated_df = pd.DataFrame({**cols, **derived}, index=list(names))
+    return calculated_df, totals
+
+# Cached chart builders (inputs are frozen tuples so cache hashing stays cheap)
+@st.cache_data
+def _build_composition_fig(quantity_items):
+    names, quantities = zip(*quantity_items)
+    fig = go.Figure(go.Pie(
+        labels=names, 
+        values=quantities, 
+        marker=dict(colors=_GREENS)
+    ))
+    fig.update_layout(title='Feedstock Composition by Weight')
+    return fig
+
+def _breakdown_fig(items, cost_label, title):
+    components, costs = zip(*items[:-1])  # Exclude total
+    fig = go.Figure(go.Bar(
+        x=costs, 
+        y=components, 
+        orientation='h',
+        marker=dict(color=costs, colorscale='Greens', colorbar=dict(title=cost_label))
+    ))
+    fig.update_layout(title=title, xaxis_title=cost_label, yaxis_title='Component')
+    return fig
+
+@st.cache_data
+def _build_capex_fig(capex_items):
+    return _breakdown_fig(capex_items, 'Cost ($)', 
+                          f'CAPEX Breakdown (Total: ${capex_items[-1][1]:,.0f})')
+
+@st.cache_data
+def _build_opex_fig(opex_items):
+    return _breakdown_fig(opex_items, 'Cost ($/year)', 
+                          f'OPEX Breakdown (Total: ${opex_items[-1][1]:,.0f}/year)')
+
+@st.cache_data
+def _build_sensitivity_fig(total_capex, total_opex, annual_energy, project_lifetime, discount_rate, energy_unit):
+    # Create sensitivity data (LCOE for each parameter across all factors at once)
+    parameters = ['CAPEX', 'OPEX', 'Energy Output', 'Discount Rate']
+    factors = np.array([0.8, 0.9, 1.0, 1.1, 1.2])
+    labels = np.array([f"{(factor-1)*100:+.0f}%" for factor in factors])
+    
+    # scales[k] holds the multipliers for parameter k in every scenario: row k varies, the rest stay at 1
+    scales = np.ones((len(parameters), len(parameters), len(factors)))
+    scales[np.arange(len(parameters)), np.arange(len(parameters))] = factors
+    
+    # One broadcast LCOE pass over all scenarios, one row per varied parameter
+    lcoe_values = calculate_lcoe_vec(total_capex * scales[0], total_opex * scales[1], annual_energy * scales[2], 
+                                     project_lifetime, discount_rate * scales[3])
+    
+    # One line per parameter
+    fig = go.Figure([
+        go.Scatter(x=labels, y=lcoe_values[i], name=parameter, 
+                   mode='lines+markers', line=dict(color=color))
+        for i, (parameter, color) in enumerate(zip(parameters, _SENS_COLORS))
+    ])
+    
+    fig.update_layout(
+        title=f'LCOE Sensitivity Analysis (${energy_unit})',
+        xaxis_title="Parameter Change",
+        yaxis_title=f"LCOE (${energy_unit})",
+        legend_title="Parameter"
+    )
+    
+    return fig
+
+@st.cache_data
+def _build_npv_fig(cash_flows, discount_rate):
+    # NPV of the equity cash flows across discount rates in one broadcast pass
+    rates = np.linspace(0, 0.2, 41)
+    npv_values = calculate_npv_vec(np.array(cash_flows), rates)
+    
+    fig = go.Figure(go.Scatter(x=rates * 100, y=npv_values, mode='lines', line=dict(color=_SENS_COLORS[0])))
+    fig.add_hline(y=0, line_dash='dot', line_color='gray')
+    fig.add_vline(x=discount_rate * 100, line_dash='dash', line_color=_SENS_COLORS[3])
+    
+    fig.update_layout(
+        title='NPV vs Discount Rate',
+        xaxis_title="Discount Rate (%)",
+        yaxis_title="NPV ($)"
+    )
+    
+    return fig
+
 # Main title
 st.title("Bioenergy Project Dashboard")
 st.markdown("Estimate the cost per GJ and MWh for your bioenergy project")
@@ -96,6 +271,8 @@ with st.sidebar:
     # Project scale slider
     project_scale = st.slider("Project Scale", 0.1, 2.0, st.session_state.project_scale, 0.1,
                              help="Scale all feedstock quantities proportionally")
+    if project_scale != st.session_state.project_scale:
+        rescale_feedstock_quantities(project_scale)
     st.session_state.project_scale = project_scale
     
     # Financial parameters
@@ -113,6 +290,16 @@ with st.sidebar:
     # Recalculate button
     recalculate = st.button("Recalculate", type="primary")
 
+# Calculate biogas yield and costs once for all tabs
+calculated_df, totals = None, None
+if st.session_state.active_feedstocks:
+    # Pick up slider changes before calculating
+    sync_feedstock_sliders()
+    calculated_df, totals = _compute_feedstock_state(
+        tuple(st.session_state.feedstock_names), 
+        st.session_state.feedstock_cols
+    )
+
 # Main content area with tabs
 tab1, tab2, tab3, tab4 = st.tabs(["Feedstock Management", "Process Configuration", "Financial Results", "Assumptions"])
 
@@ -128,19 +315,14 @@ with tab1:
         st.subheader("Feedstock Library")
         st.markdown("Drag feedstocks to your project by clicking the Add button")
         
-        # Display available feedstocks as cards
-        for feedstock_name in DEFAULT_FEEDSTOCKS.keys():
-            with st.container():
-                st.markdown(f"""
-                <div class="feedstock-card">
-                    <h4>{feedstock_name}</h4>
-                    <p>TS: {DEFAULT_FEEDSTOCKS[feedstock_name]['ts']}% | 
-                    VS: {DEFAULT_FEEDSTOCKS[feedstock_name]['vs']}% | 
-                    BMP: {DEFAULT_FEEDSTOCKS[feedstock_name]['bmp']} Nm³/t VS</p>
-                </div>
-                """, unsafe_allow_html=True)
-                st.button(f"Add {feedstock_name}", key=f"add_{feedstock_name}", 
-                         on_click=add_feedstock, args=(feedstock_name,))
+        # Display available feedstocks as cards in a single markdown block
+        st.markdown("".join(DEFAULT_FEEDSTOCK_CARDS.values()), unsafe_allow_html=True)
+        
+        # Add buttons in a compact grid below the cards
+        button_cols = st.columns(2)
+        for index, feedstock_name in enumerate(DEFAULT_FEEDSTOCKS):
+            button_cols[index % 2].button(f"Add {feedstock_name}", key=f"add_{feedstock_name}", 
+                                          on_click=add_feedstock, args=(feedstock_name,))
     
     # Active feedstocks (right column)
     with col2:
@@ -149,15 +331,9 @@ with tab1:
         if not st.session_state.active_feedstocks:
             st.info("No feedstocks added yet. Add feedstocks from the library on the left.")
         else:
-            # Create a DataFrame from active feedstocks for calculations
-            active_df = pd.DataFrame.from_dict(st.session_state.active_feedstocks, orient='index')
-            
-            # Apply project scale to quantities
-            active_df['original_quantity'] = active_df['quantity']
-            active_df['quantity'] = active_df['original_quantity'] * st.session_state.project_scale
-            
             # Display each active feedstock with sliders
             for feedstock_name, feedstock_data in st.session_state.active_feedstocks.items():
+                base = FEEDSTOCK_BASE[feedstock_name]
                 with st.expander(feedstock_name, expanded=True):
                     cols = st.columns([3, 1])
                     
@@ -167,30 +343,27 @@ with tab1:
                             f"Quantity (tonnes/year)",
                             min_value=0,
                             max_value=int(feedstock_data['original_quantity'] * 3),
-                            value=int(feedstock_data['original_quantity'] * st.session_state.project_scale),
                             key=f"quantity_{feedstock_name}"
                         )
-                        st.session_state.active_feedstocks[feedstock_name]['quantity'] = quantity
                         
                         # Distance slider
-                        distance = st.slider(
+                        st.slider(
                             f"Distance (km)",
                             min_value=0,
                             max_value=500,
-                            value=feedstock_data['distance'],
+                            value=int(feedstock_data['distance']),
                             key=f"distance_{feedstock_name}"
                         )
-                        st.session_state.active_feedstocks[feedstock_name]['distance'] = distance
                         
                         # Display key parameters
                         st.markdown(f"""
                         **Parameters:**
-                        - TS: {feedstock_data['ts']}%
-                        - VS: {feedstock_data['vs']}%
-                        - BMP: {feedstock_data['bmp']} Nm³/t VS
-                        - CH₄: {feedstock_data['ch4']}%
-                        - TKN: {feedstock_data['tkn']}%
-                        - TAN: {feedstock_data['tan']}%
+                        - TS: {base['ts']}%
+                        - VS: {base['vs']}%
+                        - BMP: {base['bmp']} Nm³/t VS
+                        - CH₄: {base['ch4']}%
+                        - TKN: {base['tkn']}%
+                        - TAN: {base['tan']}%
                         """)
                     
                     with cols[1]:
@@ -199,69 +372,52 @@ with tab1:
                         
                         # Calculate and display cost per GJ and MWh
                         if quantity > 0:
-                            # Create a single-row DataFrame for this feedstock
-                            single_df = pd.DataFrame([feedstock_data])
-                            single_df = calculate_biogas_yield(single_df)
-                            
-                            cost_per_gj = single_df['cost_per_gj'].values[0]
-                            cost_per_mwh = single_df['cost_per_mwh'].values[0]
+                            row = calculated_df.loc[feedstock_name]
                             
                             st.markdown(f"""
                             **Cost Metrics:**
-                            - ${cost_per_gj:.2f}/GJ
-                            - ${cost_per_mwh:.2f}/MWh
+                            - ${row['cost_per_gj']:.2f}/GJ
+                            - ${row['cost_per_mwh']:.2f}/MWh
                             """)
             
             # Calculate and display total metrics
-            if active_df.shape[0] > 0:
+            if calculated_df.shape[0] > 0:
                 st.subheader("Feedstock Summary")
                 
-                # Calculate biogas yield and costs
-                calculated_df = calculate_biogas_yield(active_df)
-                totals = get_total_metrics(calculated_df)
-                
-                # Display summary metrics
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total Feedstock", f"{totals['total_quantity']:.0f} tonnes/year")
-                    st.metric("Total VS", f"{totals['total_vs_tonnes']:.1f} tonnes/year")
-                
-                with col2:
-                    st.metric("Biogas Yield", f"{totals['total_biogas_yield']:.0f} Nm³/year")
-                    st.metric("Biogas Output", f"{totals['biogas_output_nm3h']:.1f} Nm³/hour")
-                
-                with col3:
-                    st.metric("Avg. Cost per GJ", f"${totals['avg_cost_per_gj']:.2f}/GJ")
-                    st.metric("Avg. Cost per MWh", f"${totals['avg_cost_per_mwh']:.2f}/MWh")
+                # Display summary metrics, filling the three columns row by row
+                metrics = [
+                    ("Total Feedstock", f"{totals['total_quantity']:.0f} tonnes/year"),
+                    ("Biogas Yield", f"{totals['total_biogas_yield']:.0f} Nm³/year"),
+                    ("Avg. Cost per GJ", f"${totals['avg_cost_per_gj']:.2f}/GJ"),
+                    ("Total VS", f"{totals['total_vs_tonnes']:.1f} tonnes/year"),
+                    ("Biogas Output", f"{totals['biogas_output_nm3h']:.1f} Nm³/hour"),
+                    ("Avg. Cost per MWh", f"${totals['avg_cost_per_mwh']:.2f}/MWh"),
+                ]
+                metric_cols = st.columns(3)
+                for index, (label, value) in enumerate(metrics):
+                    metric_cols[index % 3].metric(label, value)
                 
                 # Feedstock composition chart
                 st.subheader("Feedstock Composition")
-                fig = px.pie(
-                    calculated_df, 
-                    values='quantity', 
-                    names=calculated_df.index,
-                    title='Feedstock Composition by Weight',
-                    color_discrete_sequence=px.colors.sequential.Greens
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(_build_composition_fig(tuple(calculated_df['quantity'].items())), 
+                                use_container_width=True)
 
 # Tab 2: Process Configuration
-with tab2:
+# Rendered as a fragment: moving one of its widgets reruns only this function, with the totals
+# passed in on the last full run. A full rerun still executes it, like every other tab body.
+@st.fragment
+def render_process_tab(totals):
     st.header("Process Configuration")
     
     # Check if we have active feedstocks
     if not st.session_state.active_feedstocks:
         st.info("Please add feedstocks in the Feedstock Management tab first.")
     else:
-        # Create a DataFrame from active feedstocks for calculations
-        active_df = pd.DataFrame.from_dict(st.session_state.active_feedstocks, orient='index')
-        
-        # Apply project scale to quantities
-        active_df['quantity'] = active_df['original_quantity'] * st.session_state.project_scale
-        
-        # Calculate biogas yield and costs
-        calculated_df = calculate_biogas_yield(active_df)
-        totals = get_total_metrics(calculated_df)
+        # Calculate energy outputs based on output type
+        energy_outputs = calculate_biogas_to_energy(
+            totals['total_methane_yield'], 
+            output_type=st.session_state.output_type
+        )
         
         # Process configuration columns
         col1, col2 = st.columns(2)
@@ -341,12 +497,6 @@ with tab2:
             else:  # CHP
                 st.subheader("CHP Configuration")
                 
-                # Calculate energy outputs
-                energy_outputs = calculate_biogas_to_energy(
-                    totals['total_methane_yield'], 
-                    output_type='chp'
-                )
-                
                 # Recommended CHP size
                 recommended_chp_size = energy_outputs['power_capacity_kw']
                 
@@ -389,12 +539,6 @@ with tab2:
         # Process outputs
         st.subheader("Process Outputs")
         
-        # Calculate energy outputs based on output type
-        energy_outputs = calculate_biogas_to_energy(
-            totals['total_methane_yield'], 
-            output_type=st.session_state.output_type
-        )
-        
         # Calculate parasitic load
         parasitic_load = calculate_parasitic_load(
             digester_size * num_digesters, 
@@ -407,13 +551,22 @@ with tab2:
             totals['total_vs_tonnes']
         )
         
+        # Derive the output figures once, outside the metric formatting
+        if st.session_state.output_type == 'biogas':
+            purity_f = biomethane_purity * 0.01
+            recovery_f = methane_recovery * 0.01
+            biomethane_flow = totals['biogas_output_nm3h'] * purity_f * recovery_f
+            methane_content = totals['total_methane_yield'] / totals['total_biogas_yield'] * 100
+        else:  # CHP
+            usable_heat_mwh = energy_outputs['thermal_output_mwh'] * heat_utilization * 0.01
+        
         # Display output metrics
         col1, col2, col3 = st.columns(3)
         
         with col1:
             if st.session_state.output_type == 'biogas':
                 st.metric("Biogas Output", f"{totals['biogas_output_nm3h']:.1f} Nm³/hour")
-                st.metric("Biomethane Output", f"{totals['biogas_output_nm3h'] * biomethane_purity/100 * methane_recovery/100:.1f} Nm³/hour")
+                st.metric("Biomethane Output", f"{biomethane_flow:.1f} Nm³/hour")
                 st.metric("Energy Content", f"{energy_outputs['biogas_energy_gj']:.0f} GJ/year")
             else:  # CHP
                 st.metric("Electrical Output", f"{energy_outputs['electrical_output_mwh']:.0f} MWh/year")
@@ -422,19 +575,22 @@ with tab2:
         
         with col2:
             if st.session_state.output_type == 'biogas':
-                st.metric("Methane Content", f"{totals['total_methane_yield'] / totals['total_biogas_yield'] * 100:.1f}%")
-                st.metric("CO₂ Content", f"{100 - totals['total_methane_yield'] / totals['total_biogas_yield'] * 100:.1f}%")
+                st.metric("Methane Content", f"{methane_content:.1f}%")
+                st.metric("CO₂ Content", f"{100 - methane_content:.1f}%")
                 st.metric("Parasitic Load", f"{parasitic_load['parasitic_load_mwh']:.0f} MWh/year")
             else:  # CHP
                 st.metric("Thermal Output", f"{energy_outputs['thermal_output_mwh']:.0f} MWh/year")
                 st.metric("Heat Capacity", f"{energy_outputs['heat_capacity_kw']:.0f} kW")
-                st.metric("Usable Heat", f"{energy_outputs['thermal_output_mwh'] * heat_utilization/100:.0f} MWh/year")
+                st.metric("Usable Heat", f"{usable_heat_mwh:.0f} MWh/year")
         
         with col3:
             st.metric("Total Digestate", f"{digestate['total_digestate_tonnes']:.0f} tonnes/year")
             st.metric("Solid Digestate", f"{digestate['solid_digestate_tonnes']:.0f} tonnes/year")
             st.metric("Liquid Digestate", f"{digestate['liquid_digestate_tonnes']:.0f} tonnes/year")
 
+with tab2:
+    render_process_tab(totals)
+
 # Tab 3: Financial Results
 with tab3:
     st.header("Financial Results")
@@ -443,16 +599,6 @@ with tab3:
     if not st.session_state.active_feedstocks:
         st.info("Please add feedstocks in the Feedstock Management tab first.")
     else:
-        # Create a DataFrame from active feedstocks for calculations
-        active_df = pd.DataFrame.from_dict(st.session_state.active_feedstocks, orient='index')
-        
-        # Apply project scale to quantities
-        active_df['quantity'] = active_df['original_quantity'] * st.session_state.project_scale
-        
-        # Calculate biogas yield and costs
-        calculated_df = calculate_biogas_yield(active_df)
-        totals = get_total_metrics(calculated_df)
-        
         # Calculate digester size
         recommended_digester_size = calculate_digester_size(totals['total_vs_tonnes'])
         digester_size = recommended_digester_size  # Use recommended size for calculations
@@ -464,18 +610,27 @@ with tab3:
             output_type=st.session_state.output_type
         )
         
+        # Cost functions from the Assumptions tab
+        cost_functions = {
+            'digester_cost_per_m3': get_assumption('digester_cost_per_m3'),
+            'upgrading_cost_per_m3h': get_assumption('upgrading_cost_per_m3h'),
+            'chp_cost_per_kw': get_assumption('chp_cost_per_kw'),
+        }
+        
         # Calculate CAPEX
         if st.session_state.output_type == 'chp':
             chp_capacity = energy_outputs['power_capacity_kw']
             capex = calculate_capex(
                 digester_size * num_digesters, 
                 st.session_state.output_type, 
-                chp_capacity
+                chp_capacity, 
+                **cost_functions
             )
         else:
             capex = calculate_capex(
                 digester_size * num_digesters, 
-                st.session_state.output_type
+                st.session_state.output_type, 
+                **cost_functions
             )
         
         # Calculate OPEX
@@ -484,7 +639,10 @@ with tab3:
             digester_size * num_digesters, 
             st.session_state.output_type, 
             capex,
-            energy_outputs.get('power_capacity_kw', 0)
+            energy_outputs.get('power_capacity_kw', 0), 
+            maintenance_percentage=get_assumption('maintenance_percentage') / 100, 
+            labor_cost_small=get_assumption('labor_cost_small'), 
+            consumables_cost_per_tonne=get_assumption('consumables_cost_per_tonne')
         )
         
         # Calculate LCOE
@@ -505,11 +663,11 @@ with tab3:
         
         # Estimate revenue
         if st.session_state.output_type == 'biogas':
-            biogas_price = 15  # $/GJ
+            biogas_price = get_assumption('biogas_price')  # $/GJ
             annual_revenue = annual_energy * biogas_price
         else:  # CHP
-            electricity_price = 100  # $/MWh
-            heat_price = 10  # $/GJ
+            electricity_price = get_assumption('electricity_price')  # $/MWh
+            heat_price = get_assumption('heat_price')  # $/GJ
             heat_utilization = 0.5  # 50%
             annual_revenue = (
                 energy_outputs['electrical_output_mwh'] * electricity_price + 
@@ -517,6 +675,7 @@ with tab3:
             )
         
         # Calculate financial metrics
+        tax_rate = get_assumption('tax_rate') / 100
         financial_metrics = calculate_financial_metrics(
             capex, 
             opex, 
@@ -525,7 +684,8 @@ with tab3:
             discount_rate, 
             debt_percentage, 
             debt_interest, 
-            debt_term
+            debt_term, 
+            tax_rate
         )
         
         # Display financial results
@@ -535,40 +695,11 @@ with tab3:
             st.subheader("CAPEX Breakdown")
             
             # CAPEX breakdown chart
-            capex_df = pd.DataFrame({
-                'Component': list(capex.keys())[:-1],  # Exclude total
-                'Cost ($)': list(capex.values())[:-1]
-            })
-            
-            fig = px.bar(
-                capex_df, 
-                x='Cost ($)', 
-                y='Component', 
-                orientation='h',
-                title=f'CAPEX Breakdown (Total: ${capex["Total CAPEX"]:,.0f})',
-                color='Cost ($)',
-                color_continuous_scale='Greens'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_build_capex_fig(tuple(capex.as_dict().items())), use_container_width=True)
             
             # OPEX breakdown chart
             st.subheader("OPEX Breakdown")
-            
-            opex_df = pd.DataFrame({
-                'Component': list(opex.keys())[:-1],  # Exclude total
-                'Cost ($/year)': list(opex.values())[:-1]
-            })
-            
-            fig = px.bar(
-                opex_df, 
-                x='Cost ($/year)', 
-                y='Component', 
-                orientation='h',
-                title=f'OPEX Breakdown (Total: ${opex["Total OPEX"]:,.0f}/year)',
-                color='Cost ($/year)',
-                color_continuous_scale='Greens'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_build_opex_fig(tuple(opex.as_dict().items())), use_container_width=True)
         
         with col2:
             st.subheader("LCOE Analysis")
@@ -587,7 +718,8 @@ with tab3:
             
             with metrics_col1:
                 st.metric("Net Present Value", f"${financial_metrics['NPV']:,.0f}")
-                st.metric("Internal Rate of Return", f"{financial_metrics['IRR']*100:.1f}%")
+                irr = financial_metrics['IRR']
+                st.metric("Internal Rate of Return", f"{irr*100:.1f}%" if np.isfinite(irr) else "N/A")
             
             with metrics_col2:
                 st.metric("Payback Period", f"{financial_metrics['Payback Period']:.1f} years")
@@ -596,82 +728,33 @@ with tab3:
             # LCOE Sensitivity Analysis
             st.subheader("Sensitivity Analysis")
             
-            # Create sensitivity data
-            sensitivity_data = []
-            
-            # CAPEX sensitivity
-            for capex_factor in [0.8, 0.9, 1.0, 1.1, 1.2]:
-                capex_adj = {k: v * capex_factor for k, v in capex.items()}
-                lcoe_adj = calculate_lcoe(
-                    capex_adj, 
-                    opex, 
-                    annual_energy, 
-                    project_lifetime, 
-                    discount_rate
-                )
-                sensitivity_data.append({
-                    'Parameter': 'CAPEX',
-                    'Change': f"{(capex_factor-1)*100:+.0f}%",
-                    'LCOE': lcoe_adj,
-                    'Factor': capex_factor
-                })
-            
-            # OPEX sensitivity
-            for opex_factor in [0.8, 0.9, 1.0, 1.1, 1.2]:
-                opex_adj = {k: v * opex_factor for k, v in opex.items()}
-                lcoe_adj = calculate_lcoe(
-                    capex, 
-                    opex_adj, 
-                    annual_energy, 
-                    project_lifetime, 
-                    discount_rate
-                )
-                sensitivity_data.append({
-                    'Parameter': 'OPEX',
-                    'Change': f"{(opex_factor-1)*100:+.0f}%",
-                    'LCOE': lcoe_adj,
-                    'Factor': opex_factor
-                })
-            
-            # Energy output sensitivity
-            for output_factor in [0.8, 0.9, 1.0, 1.1, 1.2]:
-                lcoe_adj = calculate_lcoe(
-                    capex, 
-                    opex, 
-                    annual_energy * output_factor, 
-                    project_lifetime, 
-                    discount_rate
-                )
-                sensitivity_data.append({
-                    'Parameter': 'Energy Output',
-                    'Change': f"{(output_factor-1)*100:+.0f}%",
-                    'LCOE': lcoe_adj,
-                    'Factor': output_factor
-                })
-            
-            # Create sensitivity chart
-            sensitivity_df = pd.DataFrame(sensitivity_data)
-            
-            fig = px.line(
-                sensitivity_df, 
-                x='Change', 
-                y='LCOE', 
-                color='Parameter',
-                title=f'LCOE Sensitivity Analysis (${energy_unit})',
-                markers=True,
-                color_discrete_sequence=['#2E7D32', '#4CAF50', '#81C784']
+            sensitivity_fig = _build_sensitivity_fig(
+                capex.total, 
+                opex.total, 
+                annual_energy, 
+                project_lifetime, 
+                discount_rate, 
+                energy_unit
             )
-            
-            fig.update_layout(
-                xaxis_title="Parameter Change",
-                yaxis_title=f"LCOE (${energy_unit})",
-                legend_title="Parameter"
+            st.plotly_chart(sensitivity_fig, use_container_width=True)
+            
+            # NPV across discount rates
+            cash_flows = calculate_cash_flows(
+                capex, 
+                opex, 
+                annual_revenue, 
+                project_lifetime, 
+                debt_percentage, 
+                debt_interest, 
+                debt_term, 
+                tax_rate
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_build_npv_fig(tuple(cash_flows), discount_rate), use_container_width=True)
 
 # Tab 4: Assumptions
-with tab4:
+# The cost and price inputs are keyed; submitting a form reruns the whole app so the
+# Financial Results tab picks up the applied values through get_assumption
+def render_assumptions_tab():
     st.header("Assumptions")
     
     # Create tabs for different assumption categories
@@ -724,120 +807,141 @@ with tab4:
     with assumptions_tab2:
         st.subheader("Cost Functions")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**CAPEX Cost Functions:**")
-            
-            # Digester cost function
-            digester_cost_per_m3 = st.number_input(
-                "Digester Cost ($/m³)",
-                min_value=300,
-                max_value=800,
-                value=500
-            )
+        # Inputs are grouped in a form so editing them does not rerun the tab until submitted
+        with st.form("cost_functions"):
+            col1, col2 = st.columns(2)
             
-            # CHP cost function
-            chp_cost_per_kw = st.number_input(
-                "CHP Cost ($/kW)",
-                min_value=1000,
-                max_value=2500,
-                value=1500
-            )
-            
-            # Biogas upgrading cost function
-            upgrading_cost_per_m3h = st.number_input(
-                "Biogas Upgrading Cost ($/Nm³/h)",
-                min_value=5000,
-                max_value=15000,
-                value=10000
-            )
-        
-        with col2:
-            st.markdown("**OPEX Cost Functions:**")
-            
-            # Maintenance percentage
-            maintenance_percentage = st.number_input(
-                "Maintenance (% of CAPEX/year)",
-                min_value=1.0,
-                max_value=5.0,
-                value=3.0
-            ) / 100
+            with col1:
+                st.markdown("**CAPEX Cost Functions:**")
+                
+                # Digester cost function
+                st.number_input(
+                    "Digester Cost ($/m³)",
+                    min_value=300,
+                    max_value=800,
+                    value=ASSUMPTION_DEFAULTS['digester_cost_per_m3'],
+                    key="digester_cost_per_m3"
+                )
+                
+                # CHP cost function
+                st.number_input(
+                    "CHP Cost ($/kW)",
+                    min_value=1000,
+                    max_value=2500,
+                    value=ASSUMPTION_DEFAULTS['chp_cost_per_kw'],
+                    key="chp_cost_per_kw"
+                )
+                
+                # Biogas upgrading cost function
+                st.number_input(
+                    "Biogas Upgrading Cost ($/Nm³/h)",
+                    min_value=5000,
+                    max_value=15000,
+                    value=ASSUMPTION_DEFAULTS['upgrading_cost_per_m3h'],
+                    key="upgrading_cost_per_m3h"
+                )
             
-            # Labor costs
-            labor_cost_small = st.number_input(
-                "Labor Cost - Small Plant ($/year)",
-                min_value=100000,
-                max_value=200000,
-                value=150000
-            )
+            with col2:
+                st.markdown("**OPEX Cost Functions:**")
+                
+                # Maintenance percentage
+                st.number_input(
+                    "Maintenance (% of CAPEX/year)",
+                    min_value=1.0,
+                    max_value=5.0,
+                    value=ASSUMPTION_DEFAULTS['maintenance_percentage'],
+                    key="maintenance_percentage"
+                )
+                
+                # Labor costs
+                st.number_input(
+                    "Labor Cost - Small Plant ($/year)",
+                    min_value=100000,
+                    max_value=200000,
+                    value=ASSUMPTION_DEFAULTS['labor_cost_small'],
+                    key="labor_cost_small"
+                )
+                
+                # Consumables cost
+                st.number_input(
+                    "Consumables Cost ($/tonne feedstock)",
+                    min_value=1.0,
+                    max_value=5.0,
+                    value=ASSUMPTION_DEFAULTS['consumables_cost_per_tonne'],
+                    key="consumables_cost_per_tonne"
+                )
             
-            # Consumables cost
-            consumables_cost_per_tonne = st.number_input(
-                "Consumables Cost ($/tonne feedstock)",
-                min_value=1.0,
-                max_value=5.0,
-                value=2.5
-            )
+            st.form_submit_button("Apply")
     
     # Financial Assumptions
     with assumptions_tab3:
         st.subheader("Financial Assumptions")
         
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("**Revenue Assumptions:**")
-            
-            # Biogas price
-            biogas_price = st.number_input(
-                "Biogas Price ($/GJ)",
-                min_value=5.0,
-                max_value=30.0,
-                value=15.0
-            )
+        # Inputs are grouped in a form so editing them does not rerun the tab until submitted
+        with st.form("financial_assumptions"):
+            col1, col2 = st.columns(2)
             
-            # Electricity price
-            electricity_price = st.number_input(
-                "Electricity Price ($/MWh)",
-                min_value=50.0,
-                max_value=200.0,
-                value=100.0
-            )
-            
-            # Heat price
-            heat_price = st.number_input(
-                "Heat Price ($/GJ)",
-                min_value=5.0,
-                max_value=20.0,
-                value=10.0
-            )
-        
-        with col2:
-            st.markdown("**Tax and Depreciation Assumptions:**")
-            
-            # Tax rate
-            tax_rate = st.number_input(
-                "Corporate Tax Rate (%)",
-                min_value=15.0,
-                max_value=40.0,
-                value=30.0
-            ) / 100
+            with col1:
+                st.markdown("**Revenue Assumptions:**")
+                
+                # Biogas price
+                st.number_input(
+                    "Biogas Price ($/GJ)",
+                    min_value=5.0,
+                    max_value=30.0,
+                    value=ASSUMPTION_DEFAULTS['biogas_price'],
+                    key="biogas_price"
+                )
+                
+                # Electricity price
+                st.number_input(
+                    "Electricity Price ($/MWh)",
+                    min_value=50.0,
+                    max_value=200.0,
+                    value=ASSUMPTION_DEFAULTS['electricity_price'],
+                    key="electricity_price"
+                )
+                
+                # Heat price
+                st.number_input(
+                    "Heat Price ($/GJ)",
+                    min_value=5.0,
+                    max_value=20.0,
+                    value=ASSUMPTION_DEFAULTS['heat_price'],
+                    key="heat_price"
+                )
             
-            # Depreciation period
-            depreciation_period = st.number_input(
-                "Depreciation Period (years)",
-                min_value=5,
-                max_value=20,
-                value=10
-            )
+            with col2:
+                st.markdown("**Tax and Depreciation Assumptions:**")
+                
+                # Tax rate
+                st.number_input(
+                    "Corporate Tax Rate (%)",
+                    min_value=15.0,
+                    max_value=40.0,
+                    value=ASSUMPTION_DEFAULTS['tax_rate'],
+                    key="tax_rate"
+                )
+                
+                # Depreciation period (informational; the cash flow model does not depreciate CAPEX)
+                depreciation_period = st.number_input(
+                    "Depreciation Period (years)",
+                    min_value=5,
+                    max_value=20,
+                    value=10
+                )
+                
+                # Depreciation method
+                depreciation_method = st.selectbox(
+                    "Depreciation Method",
+                    ["Straight Line", "Declining Balance"],
+                    index=0
+                )
             
-            # Depreciation method
-            depreciation_method = st.selectbox(
-                "Depreciation Method",
-                ["Straight Line", "Declining Balance"],
-                index=0
-            )
+            st.form_submit_button("Apply")
+
+with tab4:
+    render_assumptions_tab()
 
 # Run the app
 if __name__ == "__main__":
@@ -3,163 +3,250 @@ Feedstock data module for the bioenergy project dashboard.
 Contains default parameters for various feedstocks based on the project requirements.
 """
 
+from types import MappingProxyType
+
+import numpy as np
 import pandas as pd
 
 # Default feedstock parameters based on the provided data
 DEFAULT_FEEDSTOCKS = {
     "Meat": {
-        "quantity": 2622,
+        "quantity": 2622.0,
         "ts": 32.0,  # Total Solids (%)
         "vs": 92.0,  # Volatile Solids (% of TS)
         "bmp": 628.4,  # Biochemical Methane Potential (Nm³/t VS)
         "ch4": 60.0,  # Methane content (%)
         "tkn": 2.75,  # Total Kjeldahl Nitrogen (% of TS)
         "tan": 17.1,  # Total Ammoniacal Nitrogen (% of TKN)
-        "distance": 50,  # Default distance in km
-        "cost_per_tonne": 20,  # Default cost in $/tonne
+        "distance": 50.0,  # Default distance in km
+        "cost_per_tonne": 20.0,  # Default cost in $/tonne
     },
     "Digestate Sludge": {
-        "quantity": 1495,
+        "quantity": 1495.0,
         "ts": 20.0,
         "vs": 89.0,
         "bmp": 280.9,
         "ch4": 55.0,
         "tkn": 1.56,
         "tan": 10.0,
-        "distance": 10,
-        "cost_per_tonne": 5,
+        "distance": 10.0,
+        "cost_per_tonne": 5.0,
     },
     "Blood Filter Cake": {
-        "quantity": 3000,
+        "quantity": 3000.0,
         "ts": 5.3,
         "vs": 96.0,
         "bmp": 660.0,
         "ch4": 68.0,
         "tkn": 13.61,
         "tan": 1.4,
-        "distance": 60,
-        "cost_per_tonne": 15,
+        "distance": 60.0,
+        "cost_per_tonne": 15.0,
     },
     "Chicken Carcasses": {
-        "quantity": 1000,
+        "quantity": 1000.0,
         "ts": 26.0,
         "vs": 86.0,
         "bmp": 402.5,
         "ch4": 60.0,
         "tkn": 5.00,
         "tan": 10.0,
-        "distance": 70,
-        "cost_per_tonne": 10,
+        "distance": 70.0,
+        "cost_per_tonne": 10.0,
     },
     "Chicken Litter": {
-        "quantity": 10000,
+        "quantity": 10000.0,
         "ts": 45.0,
         "vs": 75.0,
         "bmp": 500.0,
         "ch4": 60.0,
         "tkn": 4.86,
         "tan": 10.0,
-        "distance": 80,
-        "cost_per_tonne": 5,
+        "distance": 80.0,
+        "cost_per_tonne": 5.0,
     },
     "Grain Mix": {
-        "quantity": 2000,
+        "quantity": 2000.0,
         "ts": 87.0,
         "vs": 96.0,
         "bmp": 729.8,
         "ch4": 56.5,
         "tkn": 2.99,
         "tan": 10.0,
-        "distance": 100,
-        "cost_per_tonne": 30,
+        "distance": 100.0,
+        "cost_per_tonne": 30.0,
     },
     "Crop Straw": {
-        "quantity": 12500,
+        "quantity": 12500.0,
         "ts": 85.0,
         "vs": 75.0,
         "bmp": 350.0,
         "ch4": 51.0,
         "tkn": 0.29,
         "tan": 10.0,
-        "distance": 120,
-        "cost_per_tonne": 25,
+        "distance": 120.0,
+        "cost_per_tonne": 25.0,
     },
 }
 
+# Read-only views of the default feedstocks, shared by all active feedstock entries
+FEEDSTOCK_BASE = {name: MappingProxyType(data) for name, data in DEFAULT_FEEDSTOCKS.items()}
+
+# Pre-built feedstock library card HTML (the defaults never change at runtime)
+DEFAULT_FEEDSTOCK_CARDS = {
+    name: (
+        f'<div class="feedstock-card"><h4>{name}</h4>'
+        f"<p>TS: {data['ts']}% | VS: {data['vs']}% | BMP: {data['bmp']} Nm³/t VS</p></div>"
+    )
+    for name, data in DEFAULT_FEEDSTOCKS.items()
+}
+
+# Default feedstocks in columnar form: one float64 array per field, in the order of FEEDSTOCK_NAMES
+FEEDSTOCK_NAMES = np.array(list(DEFAULT_FEEDSTOCKS))
+FEEDSTOCK_COLS = {
+    field: np.array([data[field] for data in DEFAULT_FEEDSTOCKS.values()], dtype=np.float64)
+    for field in next(iter(DEFAULT_FEEDSTOCKS.values()))
+}
+
 def get_feedstock_df():
     """
-    Convert the default feedstock dictionary to a pandas DataFrame.
+    Convert the default feedstock columns to a pandas DataFrame.
     
     Returns:
         pandas.DataFrame: DataFrame containing feedstock parameters
     """
-    return pd.DataFrame.from_dict(DEFAULT_FEEDSTOCKS, orient='index')
+    return pd.DataFrame(FEEDSTOCK_COLS, index=FEEDSTOCK_NAMES)
+
+# Feedstock fields read by the biogas yield calculation
+YIELD_INPUT_FIELDS = ['quantity', 'ts', 'vs', 'bmp', 'ch4', 'distance', 'cost_per_tonne']
 
-def calculate_biogas_yield(feedstock_df):
+def calculate_biogas_yield_np(cols):
     """
-    Calculate the biogas yield for each feedstock.
+    Calculate the biogas yield for each feedstock from columnar arrays.
     
     Args:
-        feedstock_df (pandas.DataFrame): DataFrame containing feedstock parameters
+        cols (dict): Feedstock parameters as NumPy arrays keyed by field name
         
     Returns:
-        pandas.DataFrame: DataFrame with additional biogas yield calculations
+        dict: Biogas yield calculations as NumPy arrays keyed by column name
     """
-    # Create a copy to avoid modifying the original
-    df = feedstock_df.copy()
+    quantity = np.asarray(cols['quantity'], dtype=float)
     
     # Calculate VS content in tonnes
-    df['vs_tonnes'] = df['quantity'] * (df['ts'] / 100) * (df['vs'] / 100)
+    vs_tonnes = quantity * (np.asarray(cols['ts'], dtype=float) / 100) * (np.asarray(cols['vs'], dtype=float) / 100)
     
     # Calculate biogas yield in Nm³/year
-    df['biogas_yield'] = df['vs_tonnes'] * df['bmp']
+    biogas_yield = vs_tonnes * np.asarray(cols['bmp'], dtype=float)
     
     # Calculate methane yield in Nm³/year
-    df['methane_yield'] = df['biogas_yield'] * (df['ch4'] / 100)
+    methane_yield = biogas_yield * (np.asarray(cols['ch4'], dtype=float) / 100)
     
     # Calculate energy content (assuming 9.97 kWh/m³ CH4)
-    df['energy_content_kwh'] = df['methane_yield'] * 9.97
+    energy_content_kwh = methane_yield * 9.97
     
     # Convert to GJ (1 kWh = 0.0036 GJ)
-    df['energy_content_gj'] = df['energy_content_kwh'] * 0.0036
+    energy_content_gj = energy_content_kwh * 0.0036
     
     # Calculate transportation cost
-    df['transport_cost'] = df['quantity'] * df['distance'] * 0.1  # Assuming $0.1 per tonne-km
+    transport_cost = quantity * np.asarray(cols['distance'], dtype=float) * 0.1  # Assuming $0.1 per tonne-km
     
     # Calculate feedstock cost
-    df['feedstock_cost'] = df['quantity'] * df['cost_per_tonne']
+    feedstock_cost = quantity * np.asarray(cols['cost_per_tonne'], dtype=float)
     
     # Calculate total cost
-    df['total_cost'] = df['transport_cost'] + df['feedstock_cost']
+    total_cost = transport_cost + feedstock_cost
     
-    # Calculate cost per GJ
-    df['cost_per_gj'] = df['total_cost'] / df['energy_content_gj']
+    # Calculate cost per GJ (infinite where there is no energy, as with a pandas division)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cost_per_gj = total_cost / energy_content_gj
     
     # Calculate cost per MWh (1 MWh = 3.6 GJ)
-    df['cost_per_mwh'] = df['cost_per_gj'] * 3.6
+    cost_per_mwh = cost_per_gj * 3.6
+    
+    return {
+        'vs_tonnes': vs_tonnes,
+        'biogas_yield': biogas_yield,
+        'methane_yield': methane_yield,
+        'energy_content_kwh': energy_content_kwh,
+        'energy_content_gj': energy_content_gj,
+        'transport_cost': transport_cost,
+        'feedstock_cost': feedstock_cost,
+        'total_cost': total_cost,
+        'cost_per_gj': cost_per_gj,
+        'cost_per_mwh': cost_per_mwh
+    }
+
+def calculate_biogas_yield(feedstock_df, inplace=False):
+    """
+    Calculate the biogas yield for each feedstock.
+    
+    Args:
+        feedstock_df (pandas.DataFrame): DataFrame containing feedstock parameters
+        inplace (bool): Add the calculated columns to feedstock_df itself instead of a new DataFrame
+        
+    Returns:
+        pandas.DataFrame: DataFrame with additional biogas yield calculations
+    """
+    cols = {field: feedstock_df[field].to_numpy() for field in YIELD_INPUT_FIELDS}
+    
+    # Attach all derived columns in one step
+    derived = pd.DataFrame(calculate_biogas_yield_np(cols), index=feedstock_df.index)
+    if inplace:
+        feedstock_df[derived.columns] = derived
+        return feedstock_df
+    
+    # Replace any derived columns from an earlier calculation rather than duplicating them
+    inputs = feedstock_df.drop(columns=derived.columns, errors='ignore')
+    return pd.concat([inputs, derived], axis=1)
+
+# Columns summed by get_total_metrics and the keys their totals are reported under
+TOTAL_COLUMNS = [
+    'quantity', 'vs_tonnes', 'biogas_yield', 'methane_yield', 
+    'energy_content_gj', 'transport_cost', 'feedstock_cost', 'total_cost'
+]
+TOTAL_KEYS = [
+    'total_quantity', 'total_vs_tonnes', 'total_biogas_yield', 'total_methane_yield',
+    'total_energy_content_gj', 'total_transport_cost', 'total_feedstock_cost', 'total_cost'
+]
+assert len(TOTAL_COLUMNS) == len(TOTAL_KEYS)
+
+def calculate_feedstock_metrics_np(cols):
+    """
+    Calculate the biogas yield for each feedstock and the total metrics in one pass over arrays.
+    
+    Args:
+        cols (dict): Feedstock parameters as NumPy arrays keyed by field name
+        
+    Returns:
+        tuple: Biogas yield calculations as NumPy arrays keyed by column name, and dictionary of total metrics
+    """
+    derived = calculate_biogas_yield_np(cols)
+    columns = {**cols, **derived}
     
-    return df
+    # Sum all columns in a single pass over one stacked NumPy array
+    sums = np.array([columns[column] for column in TOTAL_COLUMNS], dtype=float).sum(axis=1)
+    
+    return derived, _totals_from_sums(sums)
 
 def get_total_metrics(feedstock_df):
     """
     Calculate total metrics across all feedstocks.
     
     Args:
-        feedstock_df (pandas.DataFrame): DataFrame containing feedstock calculations
+        feedstock_df (pandas.DataFrame): DataFrame containing feedstock parameters
         
     Returns:
         dict: Dictionary containing total metrics
     """
-    totals = {
-        'total_quantity': feedstock_df['quantity'].sum(),
-        'total_vs_tonnes': feedstock_df['vs_tonnes'].sum(),
-        'total_biogas_yield': feedstock_df['biogas_yield'].sum(),
-        'total_methane_yield': feedstock_df['methane_yield'].sum(),
-        'total_energy_content_gj': feedstock_df['energy_content_gj'].sum(),
-        'total_transport_cost': feedstock_df['transport_cost'].sum(),
-        'total_feedstock_cost': feedstock_df['feedstock_cost'].sum(),
-        'total_cost': feedstock_df['total_cost'].sum(),
-    }
+    cols = {field: feedstock_df[field].to_numpy() for field in YIELD_INPUT_FIELDS}
+    return calculate_feedstock_metrics_np(cols)[1]
+
+def _totals_from_sums(sums):
+    """
+    Build the total metrics dictionary from the column sums, in TOTAL_COLUMNS order.
+    """
+    # Plain Python floats, so the weighted averages below are scalar arithmetic
+    totals = dict(zip(TOTAL_KEYS, sums.tolist()))
     
     # Calculate weighted averages
     if totals['total_energy_content_gj'] > 0:
@@ -173,3 +260,25 @@ def get_total_metrics(feedstock_df):
     totals['biogas_output_nm3h'] = totals['total_biogas_yield'] / 8760
     
     return totals
+
+# Yields and totals for the unmodified default feedstocks, calculated once at import
+_BASELINE_DERIVED, _BASELINE_TOTALS = calculate_feedstock_metrics_np(FEEDSTOCK_COLS)
+_BASELINE_DF = pd.DataFrame({**FEEDSTOCK_COLS, **_BASELINE_DERIVED}, index=FEEDSTOCK_NAMES)
+
+def get_baseline_df():
+    """
+    Get the biogas yield calculations for the default feedstocks.
+    
+    Returns:
+        pandas.DataFrame: Copy of the precalculated DataFrame
+    """
+    return _BASELINE_DF.copy()
+
+def get_baseline_totals():
+    """
+    Get the total metrics for the default feedstocks.
+    
+    Returns:
+        dict: Dictionary containing total metrics
+    """
+    return dict(_BASELINE_TOTALS)
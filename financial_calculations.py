@@ -3,7 +3,191 @@ Financial calculations module for the bioenergy project dashboard.
 Contains functions for calculating CAPEX, OPEX, and LCOE.
 """
 
-def calculate_capex(digester_volume, output_type, chp_capacity=0):
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def _annuity_factor(project_lifetime, discount_rate):
+    """
+    Present value of one unit received at the end of every year over the project lifetime.
+    """
+    if discount_rate == 0:
+        return float(project_lifetime)
+    return (1 - (1 + discount_rate) ** -project_lifetime) / discount_rate
+
+@njit(cache=True)
+def _lcoe_core(total_capex, annual_opex, annual_energy_output, project_lifetime, discount_rate):
+    """
+    Levelized cost from total CAPEX and annual OPEX using the annuity factor.
+    """
+    annuity = _annuity_factor(project_lifetime, discount_rate)
+    return (total_capex + annual_opex * annuity) / (annual_energy_output * annuity)
+
+@njit(cache=True)
+def _discount_factors(rate, num_years):
+    """
+    Growth factors (1 + rate) ** year for years 0 to num_years - 1, built as a running product.
+    """
+    growth = np.full(num_years, 1.0 + rate)
+    growth[0] = 1.0
+    return np.cumprod(growth)
+
+@njit(cache=True)
+def _npv_core(cash_flows, rate):
+    """
+    Net present value of yearly cash flows, the first of which falls in year 0.
+    """
+    return (cash_flows / _discount_factors(rate, cash_flows.shape[0])).sum()
+
+@njit(cache=True)
+def _irr_core(cash_flows, low=-0.99, high=10.0):
+    """
+    Internal rate of return by Newton iteration, safeguarded by bisection on [low, high].
+    Returns NaN if the NPV does not change sign over that range.
+    """
+    npv_low = _npv_core(cash_flows, low)
+    if npv_low * _npv_core(cash_flows, high) > 0:
+        return np.nan
+    
+    years = np.arange(cash_flows.shape[0])
+    rate = 0.1  # Starting guess
+    for _ in range(100):
+        # NPV and its derivative with respect to the rate, from one discounted array
+        discounted = cash_flows / _discount_factors(rate, cash_flows.shape[0])
+        npv = discounted.sum()
+        dnpv = -(years * discounted).sum() / (1 + rate)
+        
+        # Keep the root bracketed
+        if npv * npv_low > 0:
+            low = rate
+            npv_low = npv
+        else:
+            high = rate
+        
+        # Newton step, falling back to bisection when it leaves the bracket
+        next_rate = rate - npv / dnpv if dnpv != 0 else low
+        if not low < next_rate < high:
+            next_rate = 0.5 * (low + high)
+        
+        if abs(next_rate - rate) < 1e-10:
+            return next_rate
+        rate = next_rate
+    
+    return rate
+
+@njit(cache=True)
+def _equity_cash_flows(annual_revenue, annual_opex, equity_amount, annual_debt_service, 
+                       debt_term, project_lifetime, tax_rate):
+    """
+    Yearly equity cash flows over the project lifetime, starting with the equity investment in year 0.
+    """
+    # Debt service is only paid during the debt term
+    years = np.arange(1, project_lifetime + 1)
+    debt_service = np.where(years <= debt_term, annual_debt_service, 0.0)
+    
+    # Simplified tax calculation (no depreciation), assuming 30% of debt service is interest
+    taxable_income = (annual_revenue - annual_opex) - debt_service * 0.3
+    tax = np.maximum(0, taxable_income * tax_rate)
+    
+    # Annual cash flows after the initial investment (equity portion)
+    cash_flows = np.empty(project_lifetime + 1)
+    cash_flows[0] = -equity_amount
+    cash_flows[1:] = annual_revenue - annual_opex - debt_service - tax
+    
+    return cash_flows
+
+@njit(cache=True)
+def _financial_kernel(annual_revenue, annual_opex, equity_amount, annual_debt_service, 
+                      debt_term, project_lifetime, discount_rate, tax_rate):
+    """
+    NPV, IRR and payback period of the equity cash flows over the project lifetime.
+    """
+    cash_flows = _equity_cash_flows(annual_revenue, annual_opex, equity_amount, annual_debt_service, 
+                                    debt_term, project_lifetime, tax_rate)
+    
+    npv = _npv_core(cash_flows, discount_rate)
+    irr = _irr_core(cash_flows)
+    
+    # Payback period is the first year the cumulative cash flow turns non-negative
+    paid_back = np.cumsum(cash_flows)[1:] >= 0
+    if paid_back.any():
+        payback_period = np.argmax(paid_back) + 1
+    else:
+        payback_period = project_lifetime + 1  # No payback within project lifetime
+    
+    return npv, irr, payback_period
+
+class CapexBreakdown(NamedTuple):
+    """
+    CAPEX breakdown in $, with the biogas upgrading or CHP system as the output-specific cost.
+    """
+    digester: float
+    reception: float
+    biogas_handling: float
+    digestate_handling: float
+    control_systems: float
+    output_specific: float
+    epc: float
+    contingency: float
+    total: float
+    output_specific_name: str
+    
+    def as_dict(self):
+        """
+        CAPEX breakdown keyed by display name, ending with the total.
+        """
+        return {
+            'Digester System': self.digester,
+            'Reception and Pre-treatment': self.reception,
+            'Biogas Handling': self.biogas_handling,
+            'Digestate Handling': self.digestate_handling,
+            'Control Systems': self.control_systems,
+            self.output_specific_name: self.output_specific,
+            'EPC Costs': self.epc,
+            'Contingency': self.contingency,
+            'Total CAPEX': self.total
+        }
+
+class OpexBreakdown(NamedTuple):
+    """
+    Annual OPEX breakdown in $, with biogas upgrading or CHP O&M as the output-specific cost.
+    """
+    maintenance: float
+    labor: float
+    consumables: float
+    insurance: float
+    output_specific: float
+    utilities: float
+    total: float
+    output_specific_name: str
+    
+    def as_dict(self):
+        """
+        OPEX breakdown keyed by display name, ending with the total.
+        """
+        return {
+            'Maintenance': self.maintenance,
+            'Labor': self.labor,
+            'Consumables': self.consumables,
+            'Insurance': self.insurance,
+            self.output_specific_name: self.output_specific,
+            'Utilities': self.utilities,
+            'Total OPEX': self.total
+        }
+
+@lru_cache(maxsize=256)
+def calculate_capex(digester_volume, output_type, chp_capacity=0, digester_cost_per_m3=500, 
+                    upgrading_cost_per_m3h=10000, chp_cost_per_kw=1500):
     """
     Calculate capital expenditure (CAPEX) for the bioenergy project.
     
@@ -11,13 +195,13 @@ def calculate_capex(digester_volume, output_type, chp_capacity=0):
         digester_volume (float): Digester volume in m³
         output_type (str): Type of output ('biogas' or 'chp')
         chp_capacity (float): CHP capacity in kW (only used if output_type is 'chp')
+        digester_cost_per_m3 (float): Base cost for digester in $ per m³
+        upgrading_cost_per_m3h (float): Biogas upgrading cost in $ per m³/h of raw biogas
+        chp_cost_per_kw (float): CHP system cost in $ per kW
     
     Returns:
-        dict: Dictionary containing CAPEX breakdown
+        CapexBreakdown: CAPEX breakdown
     """
-    # Base cost for digester ($ per m³)
-    digester_cost_per_m3 = 500
-    
     # Calculate digester cost
     digester_cost = digester_volume * digester_cost_per_m3
     
@@ -37,45 +221,38 @@ def calculate_capex(digester_volume, output_type, chp_capacity=0):
     if output_type == 'biogas':
         # Biogas upgrading system ($ per m³/h of raw biogas, assuming 8760 hours per year)
         biogas_output_m3h = (digester_volume * 1.5) / 8760  # Rough estimate of biogas output
-        upgrading_cost_per_m3h = 10000
         upgrading_cost = biogas_output_m3h * upgrading_cost_per_m3h
         
         output_specific_cost = upgrading_cost
         output_specific_name = "Biogas Upgrading System"
     else:  # CHP
         # CHP system ($ per kW)
-        chp_cost_per_kw = 1500
         chp_cost = chp_capacity * chp_cost_per_kw
         
         output_specific_cost = chp_cost
         output_specific_name = "CHP System"
     
+    # Equipment subtotal
+    subtotal = (digester_cost + reception_cost + biogas_handling_cost + 
+                digestate_handling_cost + control_systems_cost + output_specific_cost)
+    
     # Engineering, procurement, and construction (EPC) costs
-    epc_cost = 0.15 * (digester_cost + reception_cost + biogas_handling_cost + 
-                      digestate_handling_cost + control_systems_cost + output_specific_cost)
+    epc_cost = 0.15 * subtotal
     
     # Contingency
-    contingency = 0.1 * (digester_cost + reception_cost + biogas_handling_cost + 
-                        digestate_handling_cost + control_systems_cost + output_specific_cost + epc_cost)
+    contingency = 0.1 * (subtotal + epc_cost)
     
     # Total CAPEX
-    total_capex = (digester_cost + reception_cost + biogas_handling_cost + 
-                  digestate_handling_cost + control_systems_cost + output_specific_cost + 
-                  epc_cost + contingency)
+    total_capex = subtotal + epc_cost + contingency
     
-    return {
-        'Digester System': digester_cost,
-        'Reception and Pre-treatment': reception_cost,
-        'Biogas Handling': biogas_handling_cost,
-        'Digestate Handling': digestate_handling_cost,
-        'Control Systems': control_systems_cost,
-        output_specific_name: output_specific_cost,
-        'EPC Costs': epc_cost,
-        'Contingency': contingency,
-        'Total CAPEX': total_capex
-    }
+    return CapexBreakdown(
+        digester_cost, reception_cost, biogas_handling_cost, digestate_handling_cost, 
+        control_systems_cost, output_specific_cost, epc_cost, contingency, total_capex, 
+        output_specific_name
+    )
 
-def calculate_opex(total_feedstock, digester_volume, output_type, capex, chp_capacity=0):
+def calculate_opex(total_feedstock, digester_volume, output_type, capex, chp_capacity=0, 
+                   maintenance_percentage=0.03, labor_cost_small=150000, consumables_cost_per_tonne=2.5):
     """
     Calculate operational expenditure (OPEX) for the bioenergy project.
     
@@ -83,37 +260,50 @@ def calculate_opex(total_feedstock, digester_volume, output_type, capex, chp_cap
         total_feedstock (float): Total feedstock input in tonnes per year
         digester_volume (float): Digester volume in m³
         output_type (str): Type of output ('biogas' or 'chp')
-        capex (dict): CAPEX breakdown dictionary
+        capex (CapexBreakdown): CAPEX breakdown
         chp_capacity (float): CHP capacity in kW (only used if output_type is 'chp')
+        maintenance_percentage (float): Maintenance cost as a fraction of CAPEX per year
+        labor_cost_small (float): Annual labor cost of a small plant in $
+        consumables_cost_per_tonne (float): Consumables cost in $ per tonne of feedstock
     
     Returns:
-        dict: Dictionary containing OPEX breakdown
+        OpexBreakdown: OPEX breakdown
+    """
+    # Only the CAPEX total and output-specific cost are used, so cache on those scalars
+    return _opex_breakdown(total_feedstock, digester_volume, output_type, 
+                           capex.total, capex.output_specific, chp_capacity, 
+                           maintenance_percentage, labor_cost_small, consumables_cost_per_tonne)
+
+@lru_cache(maxsize=256)
+def _opex_breakdown(total_feedstock, digester_volume, output_type, total_capex, 
+                    output_specific_capex, chp_capacity, maintenance_percentage, 
+                    labor_cost_small, consumables_cost_per_tonne):
+    """
+    OPEX breakdown from the scalar inputs of calculate_opex.
     """
     # Maintenance costs (% of CAPEX per year)
-    maintenance_percentage = 0.03
-    maintenance_cost = maintenance_percentage * capex['Total CAPEX']
+    maintenance_cost = maintenance_percentage * total_capex
     
     # Labor costs (based on plant size)
     if digester_volume < 2000:
-        labor_cost = 150000  # Small plant
+        labor_cost = labor_cost_small  # Small plant
     elif digester_volume < 5000:
         labor_cost = 250000  # Medium plant
     else:
         labor_cost = 350000  # Large plant
     
     # Consumables (chemicals, water, etc.) - based on feedstock volume
-    consumables_cost_per_tonne = 2.5
     consumables_cost = total_feedstock * consumables_cost_per_tonne
     
     # Insurance (% of CAPEX per year)
     insurance_percentage = 0.01
-    insurance_cost = insurance_percentage * capex['Total CAPEX']
+    insurance_cost = insurance_percentage * total_capex
     
     # Output-specific operational costs
     if output_type == 'biogas':
         # Biogas upgrading operational costs
         upgrading_opex_percentage = 0.05
-        output_specific_cost = upgrading_opex_percentage * capex[f'Biogas Upgrading System']
+        output_specific_cost = upgrading_opex_percentage * output_specific_capex
         output_specific_name = "Biogas Upgrading O&M"
     else:  # CHP
         # CHP maintenance costs ($ per kWh, assuming 8000 operating hours per year)
@@ -131,23 +321,18 @@ def calculate_opex(total_feedstock, digester_volume, output_type, capex, chp_cap
     total_opex = (maintenance_cost + labor_cost + consumables_cost + 
                  insurance_cost + output_specific_cost + utilities_cost)
     
-    return {
-        'Maintenance': maintenance_cost,
-        'Labor': labor_cost,
-        'Consumables': consumables_cost,
-        'Insurance': insurance_cost,
-        output_specific_name: output_specific_cost,
-        'Utilities': utilities_cost,
-        'Total OPEX': total_opex
-    }
+    return OpexBreakdown(
+        maintenance_cost, labor_cost, consumables_cost, insurance_cost, 
+        output_specific_cost, utilities_cost, total_opex, output_specific_name
+    )
 
 def calculate_lcoe(capex, opex, annual_energy_output, project_lifetime=20, discount_rate=0.08):
     """
     Calculate Levelized Cost of Energy (LCOE) for the bioenergy project.
     
     Args:
-        capex (dict): CAPEX breakdown dictionary
-        opex (dict): OPEX breakdown dictionary
+        capex (CapexBreakdown): CAPEX breakdown
+        opex (OpexBreakdown): OPEX breakdown
         annual_energy_output (float): Annual energy output in GJ or MWh
         project_lifetime (int): Project lifetime in years
         discount_rate (float): Discount rate for NPV calculation
@@ -155,129 +340,161 @@ def calculate_lcoe(capex, opex, annual_energy_output, project_lifetime=20, disco
     Returns:
         float: LCOE in $ per unit of energy
     """
+    return _lcoe(capex.total, opex.total, annual_energy_output, project_lifetime, discount_rate)
+
+@lru_cache(maxsize=256)
+def _lcoe(total_capex, annual_opex, annual_energy_output, project_lifetime, discount_rate):
+    """
+    LCOE from the CAPEX and OPEX totals.
+    """
     if annual_energy_output <= 0:
         return 0
     
-    total_capex = capex['Total CAPEX']
-    annual_opex = opex['Total OPEX']
+    return _lcoe_core(total_capex, annual_opex, annual_energy_output, 
+                      project_lifetime, discount_rate)
+
+def calculate_lcoe_vec(total_capex, annual_opex, annual_energy_output, project_lifetime=20, discount_rate=0.08):
+    """
+    Calculate LCOE for arrays of CAPEX, OPEX, energy output, or discount rate values at once.
     
-    # Calculate present value of costs
-    pv_costs = total_capex
-    for year in range(1, project_lifetime + 1):
-        pv_costs += annual_opex / ((1 + discount_rate) ** year)
+    Args:
+        total_capex (float or numpy.ndarray): Total CAPEX in $
+        annual_opex (float or numpy.ndarray): Annual OPEX in $
+        annual_energy_output (float or numpy.ndarray): Annual energy output in GJ or MWh
+        project_lifetime (int): Project lifetime in years
+        discount_rate (float or numpy.ndarray): Discount rate for NPV calculation
+    
+    Returns:
+        numpy.ndarray: LCOE in $ per unit of energy, broadcast over the inputs
+    """
+    # Present value of one unit received every year over the project lifetime, per discount rate
+    rate = np.asarray(discount_rate, dtype=float)
+    nonzero_rate = np.where(rate == 0, 1.0, rate)
+    pv_factor = np.where(rate == 0, float(project_lifetime), 
+                         (1 - (1 + rate) ** -project_lifetime) / nonzero_rate)
     
-    # Calculate present value of energy
-    pv_energy = 0
-    for year in range(1, project_lifetime + 1):
-        pv_energy += annual_energy_output / ((1 + discount_rate) ** year)
+    pv_costs = np.asarray(total_capex, dtype=float) + np.asarray(annual_opex, dtype=float) * pv_factor
+    pv_energy = np.asarray(annual_energy_output, dtype=float) * pv_factor
+    pv_costs, pv_energy = np.broadcast_arrays(pv_costs, pv_energy)
     
-    # Calculate LCOE
-    lcoe = pv_costs / pv_energy if pv_energy > 0 else 0
+    # LCOE is zero wherever there is no energy output
+    lcoe = np.zeros(pv_costs.shape)
+    np.divide(pv_costs, pv_energy, out=lcoe, where=pv_energy > 0)
     
     return lcoe
 
-def calculate_financial_metrics(capex, opex, annual_revenue, project_lifetime=20, 
-                               discount_rate=0.08, debt_percentage=0.7, debt_interest=0.05, 
-                               debt_term=10, tax_rate=0.3):
+def calculate_npv_vec(cash_flows, discount_rate):
     """
-    Calculate financial metrics for the bioenergy project.
+    Calculate NPV of one series of yearly cash flows for an array of discount rates at once.
     
     Args:
-        capex (dict): CAPEX breakdown dictionary
-        opex (dict): OPEX breakdown dictionary
-        annual_revenue (float): Annual revenue in $
-        project_lifetime (int): Project lifetime in years
-        discount_rate (float): Discount rate for NPV calculation
-        debt_percentage (float): Percentage of CAPEX financed by debt
-        debt_interest (float): Annual interest rate on debt
-        debt_term (int): Debt term in years
-        tax_rate (float): Corporate tax rate
+        cash_flows (numpy.ndarray): Yearly cash flows in $, the first of which falls in year 0
+        discount_rate (float or numpy.ndarray): Discount rate for NPV calculation
     
     Returns:
-        dict: Dictionary containing financial metrics
+        numpy.ndarray: NPV in $, one per discount rate
     """
-    total_capex = capex['Total CAPEX']
-    annual_opex = opex['Total OPEX']
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    rate = np.asarray(discount_rate, dtype=float)[..., np.newaxis]
     
+    # Growth factors (1 + rate) ** year as a running product along the years, as in _discount_factors
+    growth = np.repeat(1 + rate, cash_flows.shape[0], axis=-1)
+    growth[..., 0] = 1.0
+    
+    return (cash_flows / np.cumprod(growth, axis=-1)).sum(axis=-1)
+
+def _debt_financing(total_capex, debt_percentage, debt_interest, debt_term):
+    """
+    Equity amount and annual debt service for the share of CAPEX financed by debt.
+    """
     # Calculate debt and equity amounts
     debt_amount = total_capex * debt_percentage
     equity_amount = total_capex * (1 - debt_percentage)
     
     # Calculate annual debt service
     if debt_interest > 0:
-        annual_debt_service = debt_amount * debt_interest * (1 + debt_interest) ** debt_term / ((1 + debt_interest) ** debt_term - 1)
+        debt_growth = (1 + debt_interest) ** debt_term
+        annual_debt_service = debt_amount * debt_interest * debt_growth / (debt_growth - 1)
     else:
         annual_debt_service = debt_amount / debt_term
     
-    # Initialize cash flow arrays
-    cash_flows = []
+    return equity_amount, annual_debt_service
+
+def calculate_cash_flows(capex, opex, annual_revenue, project_lifetime=20, debt_percentage=0.7, 
+                         debt_interest=0.05, debt_term=10, tax_rate=0.3):
+    """
+    Calculate the yearly equity cash flows for the bioenergy project.
     
-    # Initial investment (equity portion)
-    cash_flows.append(-equity_amount)
+    Args:
+        capex (CapexBreakdown): CAPEX breakdown
+        opex (OpexBreakdown): OPEX breakdown
+        annual_revenue (float): Annual revenue in $
+        project_lifetime (int): Project lifetime in years
+        debt_percentage (float): Percentage of CAPEX financed by debt
+        debt_interest (float): Annual interest rate on debt
+        debt_term (int): Debt term in years
+        tax_rate (float): Corporate tax rate
     
-    # Calculate annual cash flows
-    for year in range(1, project_lifetime + 1):
-        # Revenue
-        cf = annual_revenue
-        
-        # OPEX
-        cf -= annual_opex
-        
-        # Debt service (only for debt term years)
-        if year <= debt_term:
-            cf -= annual_debt_service
-        
-        # Simplified tax calculation (no depreciation)
-        taxable_income = annual_revenue - annual_opex
-        if year <= debt_term:
-            taxable_income -= annual_debt_service * 0.3  # Assume 30% of debt service is interest
-        
-        tax = max(0, taxable_income * tax_rate)
-        cf -= tax
-        
-        cash_flows.append(cf)
-    
-    # Calculate NPV
-    npv = cash_flows[0]  # Initial investment
-    for year, cf in enumerate(cash_flows[1:], 1):
-        npv += cf / ((1 + discount_rate) ** year)
-    
-    # Calculate IRR
-    # Simple approximation method
-    irr = 0.1  # Starting guess
-    step = 0.05
-    direction = 1
-    
-    for _ in range(20):  # Maximum 20 iterations
-        npv_at_irr = cash_flows[0]
-        for year, cf in enumerate(cash_flows[1:], 1):
-            npv_at_irr += cf / ((1 + irr) ** year)
-        
-        if abs(npv_at_irr) < 1:
-            break
-        
-        if npv_at_irr * direction < 0:
-            direction = -direction
-            step /= 2
-        
-        irr += step * direction
+    Returns:
+        numpy.ndarray: Cash flows in $ for years 0 to project_lifetime, starting with the equity investment
+    """
+    equity_amount, annual_debt_service = _debt_financing(capex.total, debt_percentage, 
+                                                         debt_interest, debt_term)
     
-    # Calculate payback period
-    cumulative_cf = cash_flows[0]
-    payback_period = 0
+    return _equity_cash_flows(annual_revenue, opex.total, equity_amount, annual_debt_service, 
+                              debt_term, project_lifetime, tax_rate)
+
+def calculate_financial_metrics(capex, opex, annual_revenue, project_lifetime=20, 
+                               discount_rate=0.08, debt_percentage=0.7, debt_interest=0.05, 
+                               debt_term=10, tax_rate=0.3):
+    """
+    Calculate financial metrics for the bioenergy project.
     
-    for year, cf in enumerate(cash_flows[1:], 1):
-        cumulative_cf += cf
-        if cumulative_cf >= 0 and payback_period == 0:
-            payback_period = year
+    Args:
+        capex (CapexBreakdown): CAPEX breakdown
+        opex (OpexBreakdown): OPEX breakdown
+        annual_revenue (float): Annual revenue in $
+        project_lifetime (int): Project lifetime in years
+        discount_rate (float): Discount rate for NPV calculation
+        debt_percentage (float): Percentage of CAPEX financed by debt
+        debt_interest (float): Annual interest rate on debt
+        debt_term (int): Debt term in years
+        tax_rate (float): Corporate tax rate
     
-    if payback_period == 0 and cumulative_cf < 0:
-        payback_period = project_lifetime + 1  # No payback within project lifetime
+    Returns:
+        dict: Dictionary containing financial metrics
+    """
+    npv, irr, payback_period, dscr = _financial_metrics(
+        capex.total, opex.total, annual_revenue, project_lifetime, discount_rate, 
+        debt_percentage, debt_interest, debt_term, tax_rate
+    )
     
     return {
         'NPV': npv,
         'IRR': irr,
         'Payback Period': payback_period,
-        'Debt Service Coverage Ratio': (annual_revenue - annual_opex) / annual_debt_service if annual_debt_service > 0 else float('inf'),
+        'Debt Service Coverage Ratio': dscr,
         'Equity Return': irr,
     }
+
+@lru_cache(maxsize=256)
+def _financial_metrics(total_capex, annual_opex, annual_revenue, project_lifetime, discount_rate, 
+                       debt_percentage, debt_interest, debt_term, tax_rate):
+    """
+    NPV, IRR, payback period and debt service coverage ratio from the CAPEX and OPEX totals.
+    """
+    equity_amount, annual_debt_service = _debt_financing(total_capex, debt_percentage, 
+                                                         debt_interest, debt_term)
+    
+    # Calculate NPV, IRR and payback period
+    npv, irr, payback_period = _financial_kernel(annual_revenue, annual_opex, equity_amount, annual_debt_service, 
+                                                 debt_term, project_lifetime, discount_rate, tax_rate)
+    
+    dscr = (annual_revenue - annual_opex) / annual_debt_service if annual_debt_service > 0 else float('inf')
+    
+    return npv, irr, int(payback_period), dscr
+
+# Compile the kernels at import so the first dashboard interaction does not pay for it
+_lcoe_core(1.0, 1.0, 1.0, 20, 0.08)
+_irr_core(np.array([-1.0, 0.5, 0.7]))
+_financial_kernel(1.0, 0.5, 1.0, 0.1, 10, 20, 0.08, 0.3)
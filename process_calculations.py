@@ -3,6 +3,33 @@ Process calculations module for the bioenergy project dashboard.
 Contains functions for calculating biogas production, CHP outputs, and related metrics.
 """
 
+# Energy content of methane (kWh/Nm³) and unit conversions
+METHANE_KWH = 9.97
+KWH_PER_MWH = 1000
+KWH_TO_GJ = 0.0036
+HOURS_PER_YEAR = 8760
+
+# Biogas upgrading efficiency (loss during cleaning and compression)
+UPGRADING_EFFICIENCY = 0.98
+
+# CHP electrical and thermal efficiencies
+ELECTRICAL_EFFICIENCY = 0.40
+THERMAL_EFFICIENCY = 0.45
+
+# Energy outputs per Nm³ of methane, pre-multiplied so each output is one multiplication
+METHANE_MWH = METHANE_KWH / KWH_PER_MWH
+METHANE_GJ = METHANE_KWH * KWH_TO_GJ
+BIOGAS_KWH = METHANE_KWH * UPGRADING_EFFICIENCY
+BIOGAS_MWH = BIOGAS_KWH / KWH_PER_MWH
+BIOGAS_GJ = BIOGAS_KWH * KWH_TO_GJ
+ELEC_KWH = METHANE_KWH * ELECTRICAL_EFFICIENCY
+ELEC_MWH = ELEC_KWH / KWH_PER_MWH
+ELEC_KW = ELEC_KWH / HOURS_PER_YEAR
+HEAT_KWH = METHANE_KWH * THERMAL_EFFICIENCY
+HEAT_MWH = HEAT_KWH / KWH_PER_MWH
+HEAT_GJ = HEAT_KWH * KWH_TO_GJ
+HEAT_KW = HEAT_KWH / HOURS_PER_YEAR
+
 def calculate_digester_size(total_vs_tonnes, loading_rate=3.5):
     """
     Calculate the required digester size based on volatile solids input.
@@ -33,47 +60,32 @@ def calculate_biogas_to_energy(methane_yield, output_type='biogas'):
     Returns:
         dict: Dictionary containing energy output metrics
     """
-    # Energy content of methane (kWh/Nm³)
-    methane_energy_content = 9.97
-    
-    # Total energy content (kWh)
-    total_energy_kwh = methane_yield * methane_energy_content
-    
-    # Initialize results dictionary
+    # Initialize results dictionary, each entry one multiplication from the methane yield
     results = {
-        'total_energy_kwh': total_energy_kwh,
-        'total_energy_mwh': total_energy_kwh / 1000,
-        'total_energy_gj': total_energy_kwh * 0.0036,
+        'total_energy_kwh': methane_yield * METHANE_KWH,
+        'total_energy_mwh': methane_yield * METHANE_MWH,
+        'total_energy_gj': methane_yield * METHANE_GJ,
     }
     
     if output_type == 'biogas':
-        # Biogas upgrading efficiency (loss during cleaning and compression)
-        upgrading_efficiency = 0.98
-        
         # Calculate upgraded biogas energy
-        results['biogas_energy_kwh'] = total_energy_kwh * upgrading_efficiency
-        results['biogas_energy_mwh'] = results['biogas_energy_kwh'] / 1000
-        results['biogas_energy_gj'] = results['biogas_energy_kwh'] * 0.0036
+        results['biogas_energy_kwh'] = methane_yield * BIOGAS_KWH
+        results['biogas_energy_mwh'] = methane_yield * BIOGAS_MWH
+        results['biogas_energy_gj'] = methane_yield * BIOGAS_GJ
         
     elif output_type == 'chp':
-        # CHP electrical efficiency
-        electrical_efficiency = 0.40
-        
-        # CHP thermal efficiency
-        thermal_efficiency = 0.45
-        
         # Calculate electrical output
-        results['electrical_output_kwh'] = total_energy_kwh * electrical_efficiency
-        results['electrical_output_mwh'] = results['electrical_output_kwh'] / 1000
+        results['electrical_output_kwh'] = methane_yield * ELEC_KWH
+        results['electrical_output_mwh'] = methane_yield * ELEC_MWH
         
         # Calculate thermal output
-        results['thermal_output_kwh'] = total_energy_kwh * thermal_efficiency
-        results['thermal_output_mwh'] = results['thermal_output_kwh'] / 1000
-        results['thermal_output_gj'] = results['thermal_output_kwh'] * 0.0036
+        results['thermal_output_kwh'] = methane_yield * HEAT_KWH
+        results['thermal_output_mwh'] = methane_yield * HEAT_MWH
+        results['thermal_output_gj'] = methane_yield * HEAT_GJ
         
         # Calculate power capacity (assuming 8760 hours per year)
-        results['power_capacity_kw'] = results['electrical_output_kwh'] / 8760
-        results['heat_capacity_kw'] = results['thermal_output_kwh'] / 8760
+        results['power_capacity_kw'] = methane_yield * ELEC_KW
+        results['heat_capacity_kw'] = methane_yield * HEAT_KW
         
     return results
 
@@ -154,9 +166,11 @@ def size_chp_units(power_capacity_kw):
     
     # Start with the largest units
     for size in sorted(available_sizes, reverse=True):
-        while remaining_capacity >= size * 0.8:  # Allow units to run at minimum 80% capacity
-            units.append(size)
-            remaining_capacity -= size
+        # Add as many units as can each run at minimum 80% capacity
+        if remaining_capacity >= size * 0.8:
+            count = int((remaining_capacity - size * 0.8) // size) + 1
+            units.extend([size] * count)
+            remaining_capacity -= count * size
     
     # If we still have significant capacity to cover, add one more smaller unit
     if remaining_capacity > 50: